@@ -2,6 +2,7 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from pathlib import Path
 
 #%% Set style and helper function
 plt.style.use('classic')  # Use classic style instead of seaborn
@@ -20,19 +21,33 @@ plt.rcParams.update({
 colors = ['#2c3e50', '#e74c3c', '#3498db', '#f1c40f', '#2ecc71']
 
 def make_autopct(values):
+    total = sum(values)  # computed once, not per slice callback
     def my_autopct(pct):
-        total = sum(values)
         val = int(round(pct*total/100.0))
         return f'{val}\n({pct:.1f}%)'
     return my_autopct
 
 #%% Load and prepare the data
-df = pd.read_csv('../data/Cleaned_ElectionSurvey.csv')
+# Prefer the parquet the cleaning pipeline writes: it loads much faster
+# than re-parsing the CSV and keeps the categorical dtypes.
+parquet_path = Path('../data/Cleaned_ElectionSurvey.parquet')
+if parquet_path.exists():
+    df = pd.read_parquet(parquet_path)
+else:
+    df = pd.read_csv('../data/Cleaned_ElectionSurvey.csv')
 df['Voted_Last_Election'] = df['Voted_Last_Election'].fillna('No Response')
 df['Party_Belong'] = df['Party_Belong'].fillna('No Response')
 
+#%% Precompute the distributions used throughout the analysis
+# One value_counts per column of interest instead of a fresh full-table
+# scan at every section below.
+count_columns = ['Voted_Last_Election', 'Party_Belong', 'Reason_NPP_Lost',
+                 'Know_Projects', 'Solved_Community_Problems',
+                 'NDC_Better_Than_NPP']
+counts = {column: df[column].value_counts() for column in count_columns}
+
 #%% Analyze voting patterns
-voted_distribution = df['Voted_Last_Election'].value_counts()
+voted_distribution = counts['Voted_Last_Election']
 print("\nVoting Distribution:")
 print(voted_distribution)
 
@@ -47,7 +62,7 @@ plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
 plt.tight_layout()
 
 #%% Analyze party affiliation
-party_distribution = df['Party_Belong'].value_counts()
+party_distribution = counts['Party_Belong']
 print("\nParty Affiliation Distribution:")
 print(party_distribution)
 
@@ -62,7 +77,7 @@ plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
 plt.tight_layout()
 
 #%% Analyze reasons for NPP loss
-reasons_npp_lost = df['Reason_NPP_Lost'].value_counts()
+reasons_npp_lost = counts['Reason_NPP_Lost']
 print("\nReasons for NPP Loss:")
 print(reasons_npp_lost)
 
@@ -87,7 +102,7 @@ plt.legend(title='Reasons',
 plt.tight_layout()
 
 #%% Analyze project awareness
-project_awareness = df['Know_Projects'].value_counts()
+project_awareness = counts['Know_Projects']
 print("\nProject Awareness Distribution:")
 print(project_awareness)
 
@@ -102,12 +117,12 @@ plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
 plt.tight_layout()
 
 #%% Analyze community problem solving
-problem_solving = df['Solved_Community_Problems'].value_counts()
+problem_solving = counts['Solved_Community_Problems']
 print("\nCommunity Problem Solving Assessment:")
 print(problem_solving)
 
 #%% Analyze NDC's perceived advantages
-ndc_better = df['NDC_Better_Than_NPP'].value_counts()
+ndc_better = counts['NDC_Better_Than_NPP']
 print("\nWhy NDC Was Perceived Better:")
 print(ndc_better)
 